@@ -20,7 +20,7 @@ version = 2.0
 
 # (list) Application requirements
 # comma separated e.g. requirements = sqlite3,kivy
-requirements = python3,kivy==2.3.0,pandas,numpy,openpyxl,android,jnius,pyjnius
+requirements = python3,kivy==2.3.0,pandas,numpy,openpyxl,xlsxwriter,android,jnius,pyjnius
 
 # (str) Supported orientation (landscape, portrait or all)
 orientation = landscape
@@ -4,41 +4,79 @@
 
 import os
 import sqlite3
-import pandas as pd
+import functools
 from datetime import datetime, timedelta
-from collections import defaultdict
+from collections import defaultdict, OrderedDict
 import logging
+import queue
+import atexit
+from logging.handlers import QueueHandler, QueueListener
 from kivy.app import App
 from kivy.uix.boxlayout import BoxLayout
 from kivy.uix.floatlayout import FloatLayout
-from kivy.uix.gridlayout import GridLayout
-from kivy.uix.scrollview import ScrollView
 from kivy.uix.label import Label
+from kivy.uix.image import Image
 from kivy.uix.button import Button
 from kivy.uix.textinput import TextInput
 from kivy.uix.popup import Popup
-from kivy.uix.filechooser import FileChooserListView
 from kivy.uix.screenmanager import ScreenManager, Screen
 from kivy.uix.spinner import Spinner
 from kivy.uix.progressbar import ProgressBar
+from kivy.uix.recycleview import RecycleView
+from kivy.uix.recycleview.views import RecycleDataViewBehavior
+from kivy.uix.recycleboxlayout import RecycleBoxLayout
 from kivy.core.window import Window
+from kivy.core.text import Label as CoreLabel
 from kivy.metrics import dp, sp
-from kivy.graphics import Color, Rectangle, Line, RoundedRectangle, Ellipse
+from kivy.graphics import Color, Line, RoundedRectangle, Ellipse
+from kivy.graphics.texture import Texture
 from kivy.clock import Clock
 from kivy.animation import Animation
-from kivy.properties import StringProperty, NumericProperty, ListProperty
+from kivy.properties import StringProperty, NumericProperty, ListProperty, ColorProperty, ObjectProperty, BooleanProperty
+from kivy.lang import Builder
+from kivy.factory import Factory
+from kivy.resources import resource_add_path
 import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# Configure logging - handlers run on a listener thread so log calls from the
+# import path only enqueue the record instead of writing to disk
+_log_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+_log_handlers = [
+    logging.FileHandler('student_tracker.log'),
+    logging.StreamHandler()
+]
+for _handler in _log_handlers:
+    _handler.setFormatter(_log_formatter)
+
+class _DeferredQueueHandler(QueueHandler):
+    """Enqueue records as-is so message formatting also happens on the listener thread"""
+    def prepare(self, record):
+        return record
+
+_log_queue = queue.Queue(-1)
+_log_listener = QueueListener(_log_queue, *_log_handlers, respect_handler_level=True)
+_log_listener.start()
+atexit.register(_log_listener.stop)
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('student_tracker.log'),
-        logging.StreamHandler()
-    ]
-)
 logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+logger.addHandler(_DeferredQueueHandler(_log_queue))
+logger.propagate = False
+
+# xlsxwriter streams exports row by row; without it exports use openpyxl's write-only mode
+try:
+    import xlsxwriter
+except ImportError:
+    xlsxwriter = None
+
+# python-calamine (Rust) parses .xlsx far faster than openpyxl; it is optional,
+# None lets pandas pick its default engine
+try:
+    import python_calamine  # noqa: F401
+    EXCEL_READ_ENGINE = 'calamine'
+except ImportError:
+    EXCEL_READ_ENGINE = None
 
 # ============================================
 # MODERN COLOR SCHEME - Professional & Elegant
@@ -76,6 +114,7 @@ HEADER_GRADIENT_END = (0.204, 0.459, 0.765, 1)    # Royal blue
 BUTTON_PRIMARY = PRIMARY_COLOR
 BUTTON_SECONDARY = ACCENT_COLOR
 BUTTON_HOVER = PRIMARY_LIGHT
+DISABLED_COLOR = TEXT_LIGHT
 SHADOW_COLOR = (0, 0, 0, 0.1)
 
 # ============================================
@@ -92,13 +131,23 @@ class Config:
     # Excel import settings
     POSSIBLE_SHEET_NAMES = ['note', 'noteDataTable1', 'Sheet1', 'Feuil1', 'notes']
     REQUIRED_COLUMNS = ['Matricule', 'Nom', 'Prénom']
+    IMPORT_CHUNK_SIZE = 1000
+    INDEX_REBUILD_THRESHOLD = 500
+    
+    # Excel export (rows fetched from SQLite per batch)
+    EXPORT_FETCH_SIZE = 500
     
     # Pagination
     STUDENTS_PER_PAGE = 50
+    PAGE_CACHE_SIZE = 8  # recently viewed pages kept in memory
+    
+    # Search (shorter queries fall back to a LIKE scan)
+    MIN_FTS_QUERY_LENGTH = 2
     
     # Backup
     AUTO_BACKUP_INTERVAL = 3600
     BACKUP_FOLDER = 'backups'
+    BACKUP_PAGES_PER_STEP = 1000
     
     # Validation
     MATRICULE_LENGTH = 12
@@ -112,7 +161,7 @@ class Config:
 # UTILITY FUNCTIONS
 # ============================================
 def validate_matricule(matricule):
-    """Validate student matricule format"""
+    """Validate a single student matricule (bulk imports validate the whole column at once)"""
     if not matricule:
         return False, "Matricule cannot be empty"
     
@@ -139,6 +188,103 @@ def validate_score(score):
     except ValueError:
         return False, "Score must be a number"
 
+# ============================================
+# SQL STATEMENTS
+# ============================================
+# Hot-path queries are module constants so every call passes the same string
+# and hits the connection's prepared-statement cache instead of re-parsing
+
+_SQL_SEARCH_FTS_GROUPE = '''
+    SELECT s.id, s.matricule, s.nom, s.prenom, s.section, s.groupe
+    FROM students_fts
+    JOIN students s ON s.id = students_fts.rowid
+    WHERE students_fts MATCH ? AND s.groupe = ?
+    ORDER BY bm25(students_fts)
+'''
+
+_SQL_SEARCH_FTS_ALL = '''
+    SELECT s.id, s.matricule, s.nom, s.prenom, s.section, s.groupe
+    FROM students_fts
+    JOIN students s ON s.id = students_fts.rowid
+    WHERE students_fts MATCH ?
+    ORDER BY bm25(students_fts)
+'''
+
+_SQL_SEARCH_GROUPE = '''
+    SELECT id, matricule, nom, prenom, section, groupe
+    FROM students
+    WHERE groupe = ? AND (
+        matricule LIKE ? OR
+        nom LIKE ? OR
+        prenom LIKE ?
+    )
+    ORDER BY nom, prenom
+'''
+
+_SQL_SEARCH_ALL = '''
+    SELECT id, matricule, nom, prenom, section, groupe
+    FROM students
+    WHERE matricule LIKE ? OR nom LIKE ? OR prenom LIKE ?
+    ORDER BY nom, prenom
+'''
+
+_SQL_COUNT_GROUPE = 'SELECT COUNT(*) FROM students WHERE groupe = ?'
+
+_SQL_PAGE_AFTER = '''
+    SELECT id, matricule, nom, prenom, section, groupe
+    FROM students
+    WHERE groupe = ? AND (nom, prenom, id) > (?, ?, ?)
+    ORDER BY nom, prenom, id
+    LIMIT ?
+'''
+
+_SQL_STUDENTS_BY_GROUPE = '''
+    SELECT id, matricule, nom, prenom, section, groupe
+    FROM students
+    WHERE groupe = ?
+    ORDER BY nom, prenom
+'''
+
+_SQL_ALL_GROUPS = 'SELECT DISTINCT groupe FROM students WHERE groupe IS NOT NULL ORDER BY groupe'
+
+# Student row followed by its marks/attendance aggregates; no row if the id is unknown
+_SQL_STUDENT_WITH_STATS = '''
+    SELECT
+        s.id, s.matricule, s.nom, s.prenom, s.section, s.groupe, s.created_at, s.updated_at,
+        m.total_marks, m.avg_score, m.max_score, m.min_score,
+        a.total_classes, a.present_count, a.absent_count, a.justified_count
+    FROM students AS s, (
+        SELECT
+            COUNT(score) as total_marks,
+            AVG(score) as avg_score,
+            MAX(score) as max_score,
+            MIN(score) as min_score
+        FROM marks
+        WHERE student_id = :student_id AND score IS NOT NULL
+    ) AS m, (
+        SELECT
+            COUNT(*) as total_classes,
+            SUM(CASE WHEN status = 'Present' THEN 1 ELSE 0 END) as present_count,
+            SUM(CASE WHEN status = 'Absent' THEN 1 ELSE 0 END) as absent_count,
+            SUM(CASE WHEN status = 'Absent Justifié' THEN 1 ELSE 0 END) as justified_count
+        FROM attendance
+        WHERE student_id = :student_id
+    ) AS a
+    WHERE s.id = :student_id
+'''
+
+_SQL_DELETE_STUDENT = 'DELETE FROM students WHERE id = ?'
+
+_SQL_EXPORT_GROUPE = 'SELECT * FROM students WHERE groupe = ? ORDER BY nom, prenom'
+_SQL_EXPORT_ALL = 'SELECT * FROM students ORDER BY groupe, nom, prenom'
+
+# Secondary indexes on students that large imports drop and rebuild in one pass
+# (the composite one matches the group listing filter + sort)
+_SQL_STUDENT_SECONDARY_INDEXES = {
+    'idx_student_groupe': 'CREATE INDEX IF NOT EXISTS idx_student_groupe ON students(groupe)',
+    'idx_students_groupe_name': 'CREATE INDEX IF NOT EXISTS idx_students_groupe_name ON students(groupe, nom, prenom)',
+}
+
 # ============================================
 # ENHANCED DATABASE HANDLER
 # ============================================
@@ -147,15 +293,73 @@ class StudentTrackerDB:
     
     def __init__(self, db_name=Config.DB_NAME):
         self.db_name = db_name
+        self._tls = threading.local()
+        self._connections = []
+        self._connections_lock = threading.Lock()
+        self.fts_enabled = False
         self.init_database()
         logger.info(f"Database initialized: {db_name}")
     
+    def _connect(self):
+        """Return this thread's cached connection, opening a tuned one if needed"""
+        conn = getattr(self._tls, 'conn', None)
+        if conn is not None:
+            return conn
+        
+        conn = sqlite3.connect(
+            self.db_name,
+            isolation_level=None,
+            check_same_thread=False,
+            cached_statements=256
+        )
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute('PRAGMA temp_store=MEMORY')
+        conn.execute('PRAGMA cache_size=-65536')
+        conn.execute('PRAGMA mmap_size=268435456')
+        conn.execute('PRAGMA foreign_keys=ON')
+        
+        self._tls.conn = conn
+        with self._connections_lock:
+            self._connections.append(conn)
+        return conn
+    
+    def _release_connection(self):
+        """Close the calling thread's cached connection (for short-lived worker threads)"""
+        conn = getattr(self._tls, 'conn', None)
+        if conn is None:
+            return
+        
+        self._tls.conn = None
+        with self._connections_lock:
+            if conn in self._connections:
+                self._connections.remove(conn)
+        conn.close()
+    
+    def close_all(self):
+        """Close every cached connection (call once when the app stops)"""
+        with self._connections_lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            try:
+                conn.close()
+            except Exception as e:
+                logger.error(f"Error closing database connection: {e}")
+        self._tls = threading.local()
+    
     def init_database(self):
         """Initialize database with required tables and indexes"""
-        conn = sqlite3.connect(self.db_name)
+        conn = self._connect()
         cursor = conn.cursor()
         
         try:
+            # WAL is persistent, so it only needs to be set once per database file
+            cursor.execute('PRAGMA journal_mode=WAL')
+            cursor.execute('BEGIN IMMEDIATE')
+            
+            # Databases created before attendance/marks became WITHOUT ROWID
+            # still carry a surrogate id column; move those aside for copying
+            legacy_tables = self._rename_rowid_join_tables(cursor)
+            
             # Students table
             cursor.execute('''
                 CREATE TABLE IF NOT EXISTS students (
@@ -185,29 +389,27 @@ class StudentTrackerDB:
             # Attendance table
             cursor.execute('''
                 CREATE TABLE IF NOT EXISTS attendance (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
                     student_id INTEGER NOT NULL,
                     class_id INTEGER NOT NULL,
                     status TEXT CHECK(status IN ('Present', 'Absent', 'Absent Justifié')) DEFAULT 'Present',
                     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    PRIMARY KEY(student_id, class_id),
                     FOREIGN KEY(student_id) REFERENCES students(id) ON DELETE CASCADE,
-                    FOREIGN KEY(class_id) REFERENCES classes(id) ON DELETE CASCADE,
-                    UNIQUE(student_id, class_id)
-                )
+                    FOREIGN KEY(class_id) REFERENCES classes(id) ON DELETE CASCADE
+                ) WITHOUT ROWID
             ''')
             
             # Marks table
             cursor.execute('''
                 CREATE TABLE IF NOT EXISTS marks (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
                     student_id INTEGER NOT NULL,
                     class_id INTEGER NOT NULL,
                     score REAL CHECK(score >= 0 AND score <= 20),
                     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    PRIMARY KEY(student_id, class_id),
                     FOREIGN KEY(student_id) REFERENCES students(id) ON DELETE CASCADE,
-                    FOREIGN KEY(class_id) REFERENCES classes(id) ON DELETE CASCADE,
-                    UNIQUE(student_id, class_id)
-                )
+                    FOREIGN KEY(class_id) REFERENCES classes(id) ON DELETE CASCADE
+                ) WITHOUT ROWID
             ''')
             
             # Comments table
@@ -223,59 +425,144 @@ class StudentTrackerDB:
                 )
             ''')
             
+            # Copy rows from pre-migration tables into the new layout
+            for table, columns in legacy_tables:
+                cursor.execute(f'''
+                    INSERT OR IGNORE INTO {table} ({columns})
+                    SELECT {columns} FROM {table}_legacy
+                ''')
+                cursor.execute(f'DROP TABLE {table}_legacy')
+                logger.info(f"Migrated table '{table}' to WITHOUT ROWID")
+            
+            self.fts_enabled = self._init_search_index(cursor)
+            
             # Create indexes for performance
-            cursor.execute('CREATE INDEX IF NOT EXISTS idx_student_matricule ON students(matricule)')
-            cursor.execute('CREATE INDEX IF NOT EXISTS idx_student_groupe ON students(groupe)')
-            cursor.execute('CREATE INDEX IF NOT EXISTS idx_attendance_student ON attendance(student_id)')
-            cursor.execute('CREATE INDEX IF NOT EXISTS idx_marks_student ON marks(student_id)')
+            for index_sql in _SQL_STUDENT_SECONDARY_INDEXES.values():
+                cursor.execute(index_sql)
             cursor.execute('CREATE INDEX IF NOT EXISTS idx_class_date ON classes(class_date)')
             
+            # Superseded: matricule has the UNIQUE autoindex, student_id is the
+            # leading column of the composite indexes below
+            cursor.execute('DROP INDEX IF EXISTS idx_student_matricule')
+            cursor.execute('DROP INDEX IF EXISTS idx_attendance_student')
+            cursor.execute('DROP INDEX IF EXISTS idx_marks_student')
+            
+            # Composite indexes matching the per-student aggregates
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_marks_student_score ON marks(student_id, score)')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_attendance_student_status ON attendance(student_id, status)')
+            
             conn.commit()
             logger.info("Database tables and indexes created successfully")
             
         except Exception as e:
+            conn.rollback()
             logger.error(f"Error initializing database: {e}")
             raise
-        finally:
-            conn.close()
+    
+    def _init_search_index(self, cursor):
+        """Create the FTS5 mirror of students used by search_students"""
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'students_fts'")
+        needs_rebuild = cursor.fetchone() is None
+        
+        try:
+            cursor.execute('''
+                CREATE VIRTUAL TABLE IF NOT EXISTS students_fts USING fts5(
+                    matricule, nom, prenom,
+                    content='students',
+                    content_rowid='id',
+                    tokenize='unicode61 remove_diacritics 2'
+                )
+            ''')
+        except sqlite3.OperationalError as e:
+            logger.warning(f"FTS5 not available, search will use LIKE: {e}")
+            return False
+        
+        # Keep the external-content index in sync with students
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS students_fts_ai AFTER INSERT ON students BEGIN
+                INSERT INTO students_fts(rowid, matricule, nom, prenom)
+                VALUES (new.id, new.matricule, new.nom, new.prenom);
+            END
+        ''')
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS students_fts_ad AFTER DELETE ON students BEGIN
+                INSERT INTO students_fts(students_fts, rowid, matricule, nom, prenom)
+                VALUES ('delete', old.id, old.matricule, old.nom, old.prenom);
+            END
+        ''')
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS students_fts_au AFTER UPDATE OF matricule, nom, prenom ON students BEGIN
+                INSERT INTO students_fts(students_fts, rowid, matricule, nom, prenom)
+                VALUES ('delete', old.id, old.matricule, old.nom, old.prenom);
+                INSERT INTO students_fts(rowid, matricule, nom, prenom)
+                VALUES (new.id, new.matricule, new.nom, new.prenom);
+            END
+        ''')
+        
+        if needs_rebuild:
+            # Index students that existed before the FTS table was added
+            cursor.execute("INSERT INTO students_fts(students_fts) VALUES ('rebuild')")
+        
+        return True
+    
+    def _rename_rowid_join_tables(self, cursor):
+        """Rename old rowid-based attendance/marks tables to <name>_legacy"""
+        join_tables = {
+            'attendance': 'student_id, class_id, status, created_at',
+            'marks': 'student_id, class_id, score, created_at',
+        }
+        legacy_tables = []
+        
+        for table, columns in join_tables.items():
+            cursor.execute(f'PRAGMA table_info({table})')
+            if 'id' in [row[1] for row in cursor.fetchall()]:
+                cursor.execute(f'ALTER TABLE {table} RENAME TO {table}_legacy')
+                legacy_tables.append((table, columns))
+        
+        return legacy_tables
     
     def import_from_excel(self, file_path, groupe_name=None, progress_callback=None):
         """Import student data from Excel file with improved sheet detection"""
         try:
-            logger.info(f"Starting Excel import from: {file_path}")
-            
-            # Try to detect the correct sheet
-            xl_file = pd.ExcelFile(file_path)
-            sheet_name = None
-            
-            for possible_name in Config.POSSIBLE_SHEET_NAMES:
-                if possible_name in xl_file.sheet_names:
-                    sheet_name = possible_name
-                    break
+            # pandas/numpy are only needed here; importing them lazily keeps them off cold start
+            import numpy as np
+            import pandas as pd
             
-            if sheet_name is None and xl_file.sheet_names:
-                sheet_name = xl_file.sheet_names[0]
-                logger.warning(f"Using first available sheet: {sheet_name}")
-            else:
-                logger.info(f"Found sheet: {sheet_name}")
+            logger.info(f"Starting Excel import from: {file_path}")
             
-            df = pd.read_excel(file_path, sheet_name=sheet_name)
+            # Try to detect the correct sheet, then parse it from the already-open workbook
+            with pd.ExcelFile(file_path, engine=EXCEL_READ_ENGINE) as xl_file:
+                sheet_name = None
+                
+                for possible_name in Config.POSSIBLE_SHEET_NAMES:
+                    if possible_name in xl_file.sheet_names:
+                        sheet_name = possible_name
+                        break
+                
+                if sheet_name is None and xl_file.sheet_names:
+                    sheet_name = xl_file.sheet_names[0]
+                    logger.warning(f"Using first available sheet: {sheet_name}")
+                else:
+                    logger.info(f"Found sheet: {sheet_name}")
+                
+                # Every field is stringified anyway, so skip dtype and NA inference
+                df = xl_file.parse(sheet_name, header=None, dtype=str, na_filter=False)
             
             if progress_callback:
                 progress_callback(0.1)
             
-            # Find the header row containing 'Matricule'
+            # Find the header row containing 'Matricule' with a vectorized scan per
+            # column (a boolean mask, not a fixed-width copy of every cell)
             matricule_col = None
             header_row_idx = 0
             
-            for idx, row in df.iterrows():
-                for col_idx, cell in enumerate(row):
-                    if isinstance(cell, str) and 'Matricule' in cell:
-                        header_row_idx = idx
-                        matricule_col = col_idx
-                        break
-                if matricule_col is not None:
-                    break
+            found = np.zeros(df.shape, dtype=bool)
+            for i in range(df.shape[1]):
+                found[:, i] = df.iloc[:, i].str.contains('Matricule', regex=False)
+            rows_idx, cols_idx = np.nonzero(found)
+            if len(rows_idx):
+                header_row_idx = int(rows_idx[0])
+                matricule_col = int(cols_idx[0])
             
             if matricule_col is None:
                 error_msg = f"Could not find 'Matricule' column in sheet '{sheet_name}'"
@@ -294,60 +581,109 @@ class StudentTrackerDB:
             if progress_callback:
                 progress_callback(0.2)
             
-            conn = sqlite3.connect(self.db_name)
+            # Vectorized cleanup and validation (one pass instead of per-row checks)
+            df['Matricule'] = df['Matricule'].str.strip()
+            df = df[df['Matricule'] != '']
+            matricules = df['Matricule']
+            valid = matricules.str.len().eq(Config.MATRICULE_LENGTH) & matricules.str.fullmatch(r'\d+')
+            skipped_rows = (df.index[~valid] + 1).tolist()
+            skipped_count = len(skipped_rows)
+            if skipped_count:
+                logger.warning(
+                    f"Skipped {skipped_count} rows with an invalid matricule "
+                    f"(rows {', '.join(map(str, skipped_rows[:10]))}{'...' if skipped_count > 10 else ''})"
+                )
+            df = df[valid]
+            
+            def clean_column(name):
+                if name not in df.columns:
+                    return [''] * len(df)
+                return df[name].str.strip()
+            
+            rows = list(zip(
+                df['Matricule'],
+                clean_column('Nom'),
+                clean_column('Prénom'),
+                clean_column('Section'),
+                clean_column('Groupe')
+            ))
+            
+            conn = self._connect()
             cursor = conn.cursor()
-            imported_count = 0
-            errors = []
-            
-            total_rows = len(df)
+            chunk_size = Config.IMPORT_CHUNK_SIZE
+            total_rows = len(rows)
             
-            for idx, row in df.iterrows():
-                try:
-                    if pd.isna(row.get('Matricule')):
-                        continue
-                    
-                    matricule = str(row['Matricule']).strip()
-                    
-                    is_valid, error_msg = validate_matricule(matricule)
-                    if not is_valid:
-                        errors.append(f"Row {idx + 1}: {error_msg}")
-                        continue
-                    
-                    nom = str(row.get('Nom', '')).strip()
-                    prenom = str(row.get('Prénom', '')).strip()
-                    section = str(row.get('Section', '')).strip()
-                    groupe = str(row.get('Groupe', '')).strip()
-                    
-                    if groupe_name:
-                        groupe = groupe_name
-                    
-                    cursor.execute('''
-                        INSERT OR REPLACE INTO students 
-                        (matricule, nom, prenom, section, groupe, updated_at)
-                        VALUES (?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
-                    ''', (matricule, nom, prenom, section, groupe))
-                    
-                    imported_count += 1
-                    
-                    if progress_callback and idx % 10 == 0:
-                        progress = 0.2 + (0.7 * (idx / total_rows))
-                        progress_callback(progress)
+            try:
+                cursor.execute('BEGIN IMMEDIATE')
+                
+                # Stage the rows in a memory-backed temp table, then copy them
+                # into students with a single statement run inside SQLite
+                cursor.execute('''
+                    CREATE TEMP TABLE IF NOT EXISTS _import_staging (
+                        matricule TEXT, nom TEXT, prenom TEXT, section TEXT, groupe TEXT
+                    )
+                ''')
+                cursor.execute('DELETE FROM temp._import_staging')
+                
+                for start in range(0, total_rows, chunk_size):
+                    cursor.executemany(
+                        'INSERT INTO temp._import_staging VALUES (?, ?, ?, ?, ?)',
+                        rows[start:start + chunk_size]
+                    )
                     
-                except Exception as e:
-                    error_msg = f"Row {idx + 1}: {str(e)}"
-                    errors.append(error_msg)
-                    logger.error(error_msg)
-                    continue
+                    if progress_callback:
+                        done = min(start + chunk_size, total_rows)
+                        progress_callback(0.2 + (0.6 * (done / total_rows)))
+                
+                # Building the indexes once after a large load beats updating
+                # them row by row; the matricule autoindex stays for ON CONFLICT
+                rebuild_indexes = total_rows > Config.INDEX_REBUILD_THRESHOLD
+                if rebuild_indexes:
+                    for index_name in _SQL_STUDENT_SECONDARY_INDEXES:
+                        cursor.execute(f'DROP INDEX IF EXISTS {index_name}')
+                
+                # Upsert keeps the student's id, created_at and their cascaded
+                # attendance/marks rows; unchanged students are not rewritten.
+                # ("WHERE true" disambiguates ON CONFLICT after a SELECT.)
+                cursor.execute('''
+                    INSERT INTO students (matricule, nom, prenom, section, groupe)
+                    SELECT matricule, nom, prenom, section, COALESCE(?, groupe)
+                    FROM temp._import_staging WHERE true
+                    ON CONFLICT(matricule) DO UPDATE SET
+                        nom = excluded.nom,
+                        prenom = excluded.prenom,
+                        section = excluded.section,
+                        groupe = excluded.groupe,
+                        updated_at = CURRENT_TIMESTAMP
+                    WHERE nom IS NOT excluded.nom
+                       OR prenom IS NOT excluded.prenom
+                       OR section IS NOT excluded.section
+                       OR groupe IS NOT excluded.groupe
+                ''', (groupe_name,))
+                cursor.execute('DROP TABLE temp._import_staging')
+                
+                if rebuild_indexes:
+                    for index_sql in _SQL_STUDENT_SECONDARY_INDEXES.values():
+                        cursor.execute(index_sql)
+                
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
             
-            conn.commit()
-            conn.close()
+            if progress_callback:
+                progress_callback(0.9)
+            
+            self._invalidate_cache()
+            
+            imported_count = total_rows
             
             if progress_callback:
                 progress_callback(1.0)
             
             message = f"Successfully imported {imported_count} students"
-            if errors:
-                message += f"\nWarnings: {len(errors)} rows skipped"
+            if skipped_count:
+                message += f"\nWarnings: {skipped_count} rows skipped"
             
             logger.info(message)
             return True, message, imported_count
@@ -357,24 +693,52 @@ class StudentTrackerDB:
             logger.error(error_msg)
             return False, error_msg, 0
     
+    def import_from_excel_async(self, file_path, groupe_name=None, progress_callback=None, on_done=None):
+        """Run import_from_excel on a worker thread, reporting back on the Kivy main thread"""
+        thread = threading.Thread(
+            target=self._do_import,
+            args=(file_path, groupe_name, progress_callback, on_done),
+            daemon=True
+        )
+        thread.start()
+        return thread
+    
+    def _do_import(self, file_path, groupe_name, progress_callback, on_done):
+        def report_progress(progress):
+            Clock.schedule_once(lambda dt: progress_callback(progress), 0)
+        
+        try:
+            success, message, count = self.import_from_excel(
+                file_path,
+                groupe_name,
+                progress_callback=report_progress if progress_callback else None
+            )
+        finally:
+            self._release_connection()
+        
+        if on_done:
+            Clock.schedule_once(lambda dt: on_done(success, message, count), 0)
+    
     def export_to_excel(self, output_path, groupe=None):
         """Export student data to Excel file"""
         try:
-            conn = sqlite3.connect(self.db_name)
+            conn = self._connect()
+            cursor = conn.cursor()
+            cursor.arraysize = Config.EXPORT_FETCH_SIZE
             
             if groupe:
-                query = "SELECT * FROM students WHERE groupe = ? ORDER BY nom, prenom"
-                df = pd.read_sql_query(query, conn, params=(groupe,))
+                cursor.execute(_SQL_EXPORT_GROUPE, (groupe,))
             else:
-                query = "SELECT * FROM students ORDER BY groupe, nom, prenom"
-                df = pd.read_sql_query(query, conn)
+                cursor.execute(_SQL_EXPORT_ALL)
             
-            conn.close()
+            columns = [description[0] for description in cursor.description]
             
-            with pd.ExcelWriter(output_path, engine='openpyxl') as writer:
-                df.to_excel(writer, sheet_name='Students', index=False)
+            if xlsxwriter is None:
+                exported_count = self._stream_to_openpyxl(cursor, columns, output_path)
+            else:
+                exported_count = self._stream_to_xlsx(cursor, columns, output_path)
             
-            message = f"Exported {len(df)} students to {output_path}"
+            message = f"Exported {exported_count} students to {output_path}"
             logger.info(message)
             return True, message
             
@@ -383,6 +747,55 @@ class StudentTrackerDB:
             logger.error(error_msg)
             return False, error_msg
     
+    def _stream_to_xlsx(self, cursor, columns, output_path):
+        """Write cursor rows straight to disk, flushing each row (constant memory)"""
+        workbook = xlsxwriter.Workbook(output_path, {'constant_memory': True})
+        try:
+            worksheet = workbook.add_worksheet('Students')
+            worksheet.write_row(0, 0, columns, workbook.add_format({'bold': True}))
+            
+            row_idx = 0
+            while True:
+                batch = cursor.fetchmany()
+                if not batch:
+                    break
+                for row in batch:
+                    row_idx += 1
+                    worksheet.write_row(row_idx, 0, row)
+        finally:
+            workbook.close()
+        
+        return row_idx
+    
+    def _stream_to_openpyxl(self, cursor, columns, output_path):
+        """Append cursor rows to a write-only openpyxl workbook (rows are not kept as cells)"""
+        from openpyxl import Workbook
+        from openpyxl.cell import WriteOnlyCell
+        from openpyxl.styles import Font
+        
+        workbook = Workbook(write_only=True)
+        worksheet = workbook.create_sheet('Students')
+        
+        header_font = Font(bold=True)
+        header = []
+        for name in columns:
+            cell = WriteOnlyCell(worksheet, value=name)
+            cell.font = header_font
+            header.append(cell)
+        worksheet.append(header)
+        
+        row_count = 0
+        while True:
+            batch = cursor.fetchmany()
+            if not batch:
+                break
+            for row in batch:
+                worksheet.append(row)
+            row_count += len(batch)
+        
+        workbook.save(output_path)
+        return row_count
+    
     def backup_database(self):
         """Create a backup of the database"""
         try:
@@ -393,8 +806,14 @@ class StudentTrackerDB:
             backup_name = f"backup_{timestamp}.db"
             backup_path = os.path.join(Config.BACKUP_FOLDER, backup_name)
             
-            import shutil
-            shutil.copy2(self.db_name, backup_path)
+            # Online backup copies a consistent snapshot (WAL included) in steps,
+            # letting other connections keep reading and writing in between
+            src = self._connect()
+            dst = sqlite3.connect(backup_path)
+            try:
+                src.backup(dst, pages=Config.BACKUP_PAGES_PER_STEP, progress=self._report_backup)
+            finally:
+                dst.close()
             
             logger.info(f"Database backed up to: {backup_path}")
             return True, backup_path
@@ -404,163 +823,185 @@ class StudentTrackerDB:
             logger.error(error_msg)
             return False, error_msg
     
+    def _report_backup(self, status, remaining, total):
+        logger.debug(f"Backup progress: {total - remaining}/{total} pages")
+    
     def search_students(self, query, groupe=None):
         """Search students by name or matricule"""
         try:
-            conn = sqlite3.connect(self.db_name)
-            cursor = conn.cursor()
-            
-            search_pattern = f"%{query}%"
-            
-            if groupe:
-                cursor.execute('''
-                    SELECT id, matricule, nom, prenom, section, groupe 
-                    FROM students 
-                    WHERE groupe = ? AND (
-                        matricule LIKE ? OR 
-                        nom LIKE ? OR 
-                        prenom LIKE ?
-                    )
-                    ORDER BY nom, prenom
-                ''', (groupe, search_pattern, search_pattern, search_pattern))
-            else:
-                cursor.execute('''
-                    SELECT id, matricule, nom, prenom, section, groupe 
-                    FROM students 
-                    WHERE matricule LIKE ? OR nom LIKE ? OR prenom LIKE ?
-                    ORDER BY nom, prenom
-                ''', (search_pattern, search_pattern, search_pattern))
-            
-            results = cursor.fetchall()
-            conn.close()
+            query = query.strip()
+            if self.fts_enabled and len(query) >= Config.MIN_FTS_QUERY_LENGTH:
+                try:
+                    return self._search_students_fts(query, groupe)
+                except sqlite3.OperationalError as e:
+                    logger.warning(f"FTS search failed, falling back to LIKE: {e}")
             
-            return results
+            return self._search_students_like(query, groupe)
             
         except Exception as e:
             logger.error(f"Search error: {e}")
             return []
     
-    def get_students_paginated(self, groupe, page=1, per_page=Config.STUDENTS_PER_PAGE):
-        """Get students with pagination"""
+    def _search_students_fts(self, query, groupe=None):
+        """Prefix search through the students_fts inverted index"""
+        # Quote every term so user input is never parsed as FTS5 syntax
+        match = ' '.join('"' + term.replace('"', '""') + '"*' for term in query.split())
+        
+        conn = self._connect()
+        cursor = conn.cursor()
+        
+        if groupe:
+            cursor.execute(_SQL_SEARCH_FTS_GROUPE, (match, groupe))
+        else:
+            cursor.execute(_SQL_SEARCH_FTS_ALL, (match,))
+        
+        return cursor.fetchall()
+    
+    def _search_students_like(self, query, groupe=None):
+        """Substring search (full table scan) for very short queries"""
+        conn = self._connect()
+        cursor = conn.cursor()
+        
+        search_pattern = f"%{query}%"
+        
+        if groupe:
+            cursor.execute(_SQL_SEARCH_GROUPE, (groupe, search_pattern, search_pattern, search_pattern))
+        else:
+            cursor.execute(_SQL_SEARCH_ALL, (search_pattern, search_pattern, search_pattern))
+        
+        return cursor.fetchall()
+    
+    def get_students_after(self, groupe, last_nom=None, last_prenom=None, last_id=None,
+                           per_page=Config.STUDENTS_PER_PAGE):
+        """Get the page of students after a (nom, prenom, id) keyset cursor"""
+        # Seeks straight to the cursor in idx_students_groupe_name, so deep pages
+        # cost the same as the first; next_cursor is None on the last page
         try:
-            offset = (page - 1) * per_page
+            if last_id is None:
+                last_nom, last_prenom, last_id = '', '', 0
             
-            conn = sqlite3.connect(self.db_name)
+            conn = self._connect()
             cursor = conn.cursor()
             
-            cursor.execute('SELECT COUNT(*) FROM students WHERE groupe = ?', (groupe,))
-            total_count = cursor.fetchone()[0]
-            
-            cursor.execute('''
-                SELECT id, matricule, nom, prenom, section, groupe 
-                FROM students 
-                WHERE groupe = ? 
-                ORDER BY nom, prenom
-                LIMIT ? OFFSET ?
-            ''', (groupe, per_page, offset))
-            
+            # One extra row tells us whether another page exists
+            cursor.execute(_SQL_PAGE_AFTER, (groupe, last_nom, last_prenom, last_id, per_page + 1))
             students = cursor.fetchall()
-            conn.close()
             
-            total_pages = (total_count + per_page - 1) // per_page
+            next_cursor = None
+            if len(students) > per_page:
+                students = students[:per_page]
+                last = students[-1]
+                next_cursor = (last[2], last[3], last[0])
             
-            return students, page, total_pages, total_count
+            return students, next_cursor
             
         except Exception as e:
             logger.error(f"Pagination error: {e}")
-            return [], 1, 1, 0
+            return [], None
+    
+    def _invalidate_cache(self):
+        """Drop cached lookups after any write to students/marks/attendance"""
+        self._get_students_by_group_uncached.cache_clear()
+        self._get_all_groups_uncached.cache_clear()
+        self._get_student_with_stats_uncached.cache_clear()
+        self._count_students_uncached.cache_clear()
+    
+    def count_students(self, groupe):
+        """Get the number of students in a group"""
+        try:
+            return self._count_students_uncached(groupe)
+        except Exception as e:
+            logger.error(f"Error counting students: {e}")
+            return 0
+    
+    @functools.lru_cache(maxsize=128)
+    def _count_students_uncached(self, groupe):
+        conn = self._connect()
+        cursor = conn.cursor()
+        cursor.execute(_SQL_COUNT_GROUPE, (groupe,))
+        return cursor.fetchone()[0]
     
     def get_students_by_group(self, groupe):
         """Get all students in a specific group"""
-        conn = sqlite3.connect(self.db_name)
+        return list(self._get_students_by_group_uncached(groupe))
+    
+    @functools.lru_cache(maxsize=128)
+    def _get_students_by_group_uncached(self, groupe):
+        conn = self._connect()
         cursor = conn.cursor()
-        cursor.execute('''
-            SELECT id, matricule, nom, prenom, section, groupe 
-            FROM students 
-            WHERE groupe = ? 
-            ORDER BY nom, prenom
-        ''', (groupe,))
-        students = cursor.fetchall()
-        conn.close()
-        return students
+        cursor.execute(_SQL_STUDENTS_BY_GROUPE, (groupe,))
+        return tuple(cursor.fetchall())
     
     def get_all_groups(self):
         """Get list of all unique groups"""
-        conn = sqlite3.connect(self.db_name)
+        return list(self._get_all_groups_uncached())
+    
+    @functools.lru_cache(maxsize=128)
+    def _get_all_groups_uncached(self):
+        conn = self._connect()
         cursor = conn.cursor()
-        cursor.execute('SELECT DISTINCT groupe FROM students WHERE groupe IS NOT NULL ORDER BY groupe')
-        groups = [row[0] for row in cursor.fetchall()]
-        conn.close()
-        return groups
+        cursor.execute(_SQL_ALL_GROUPS)
+        return tuple(row[0] for row in cursor.fetchall())
     
-    def get_student_stats(self, student_id):
-        """Get comprehensive statistics for a student"""
+    def get_student_with_stats(self, student_id):
+        """Get a student row together with its comprehensive statistics"""
         try:
-            conn = sqlite3.connect(self.db_name)
-            cursor = conn.cursor()
-            
-            cursor.execute('SELECT * FROM students WHERE id = ?', (student_id,))
-            student = cursor.fetchone()
-            
-            if not student:
+            stats = self._get_student_with_stats_uncached(student_id)
+            if stats is None:
                 return None
-            
-            cursor.execute('''
-                SELECT 
-                    COUNT(score) as total_marks,
-                    AVG(score) as avg_score,
-                    MAX(score) as max_score,
-                    MIN(score) as min_score
-                FROM marks 
-                WHERE student_id = ? AND score IS NOT NULL
-            ''', (student_id,))
-            
-            marks_stats = cursor.fetchone()
-            
-            cursor.execute('''
-                SELECT 
-                    status,
-                    COUNT(*) as count
-                FROM attendance 
-                WHERE student_id = ?
-                GROUP BY status
-            ''', (student_id,))
-            
-            attendance_data = cursor.fetchall()
-            attendance_dist = {status: count for status, count in attendance_data}
-            
-            total_attendance = sum(attendance_dist.values())
-            present_count = attendance_dist.get('Present', 0)
-            attendance_rate = (present_count / total_attendance * 100) if total_attendance > 0 else 0
-            
-            conn.close()
-            
-            return {
-                'student': student,
-                'total_marks': marks_stats[0] or 0,
-                'avg_score': round(marks_stats[1], 2) if marks_stats[1] else 0,
-                'max_score': marks_stats[2] or 0,
-                'min_score': marks_stats[3] or 0,
-                'total_classes': total_attendance,
-                'present_count': present_count,
-                'attendance_rate': round(attendance_rate, 1),
-                'attendance_dist': attendance_dist
-            }
+            return dict(stats, attendance_dist=dict(stats['attendance_dist']))
             
         except Exception as e:
             logger.error(f"Error getting student stats: {e}")
             return None
     
+    @functools.lru_cache(maxsize=128)
+    def _get_student_with_stats_uncached(self, student_id):
+        conn = self._connect()
+        cursor = conn.cursor()
+        
+        # Student row and both aggregates in one round-trip: the students side
+        # is a primary-key lookup and each aggregate a single covering-index
+        # range scan that yields exactly one row
+        cursor.execute(_SQL_STUDENT_WITH_STATS, {'student_id': student_id})
+        row = cursor.fetchone()
+        
+        if not row:
+            return None
+        
+        student = row[:8]
+        (total_marks, avg_score, max_score, min_score,
+         total_attendance, present_count, absent_count, justified_count) = row[8:]
+        
+        present_count = present_count or 0
+        attendance_rate = (present_count / total_attendance * 100) if total_attendance > 0 else 0
+        
+        return {
+            'student': student,
+            'total_marks': total_marks or 0,
+            'avg_score': round(avg_score, 2) if avg_score else 0,
+            'max_score': max_score or 0,
+            'min_score': min_score or 0,
+            'total_classes': total_attendance,
+            'present_count': present_count,
+            'attendance_rate': round(attendance_rate, 1),
+            'attendance_dist': {
+                'Present': present_count,
+                'Absent': absent_count or 0,
+                'Absent Justifié': justified_count or 0
+            }
+        }
+    
     def delete_student(self, student_id):
         """Delete a student and all related records"""
         try:
-            conn = sqlite3.connect(self.db_name)
+            conn = self._connect()
             cursor = conn.cursor()
             
-            cursor.execute('DELETE FROM students WHERE id = ?', (student_id,))
+            cursor.execute(_SQL_DELETE_STUDENT, (student_id,))
             
             conn.commit()
-            conn.close()
+            self._invalidate_cache()
             
             logger.info(f"Deleted student {student_id}")
             return True, "Student deleted successfully"
@@ -573,179 +1014,245 @@ class StudentTrackerDB:
 # MODERN UI COMPONENTS
 # ============================================
 
-class ModernCard(BoxLayout):
-    """Modern card with shadow and rounded corners"""
+# Metrics used by the shared widgets, resolved once instead of per instance
+_DP = {n: dp(n) for n in (5, 8, 10, 12, 15, 20, 30, 40, 45, 50, 60, 70, 80, 100, 120, 150, 280)}
+_SP = {n: sp(n) for n in (11, 13, 14, 16, 20, 24, 28, 40, 50, 60)}
+# Corner radii shared by every rounded shape instead of a new list per widget
+_R8 = (_DP[8],)
+
+resource_add_path(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'assets'))
+
+# Background shapes for the shared widgets; KV keeps them in step with
+# pos/size through compiled bindings rather than Python update callbacks
+Builder.load_string('''
+#:set R8 [dp(8)]
+#:set R10 [dp(10)]
+
+<ModernCard>:
+    canvas.before:
+        Color:
+            rgba: self.card_color
+        # Card and its drop shadow are baked into one 9-patch with a 4dp margin
+        BorderImage:
+            source: 'card_9patch.png'
+            pos: self.x - dp(4), self.y - dp(4)
+            size: self.width + dp(8), self.height + dp(8)
+            border: 40, 40, 40, 40
+            display_border: [dp(20), dp(20), dp(20), dp(20)]
+
+<ModernButton>:
+    canvas.before:
+        Color:
+            rgba: self.fill_color
+        RoundedRectangle:
+            pos: self.pos
+            size: self.size
+            radius: R8
+
+<GradientHeader>:
+    canvas.before:
+        Color:
+            rgba: 1, 1, 1, 1
+        Rectangle:
+            pos: self.pos
+            size: self.size
+            texture: self.gradient_texture
+
+<SearchBar>:
+    canvas.before:
+        Color:
+            rgba: self.card_color
+        RoundedRectangle:
+            pos: self.pos
+            size: self.size
+            radius: R10
+''')
+
+@functools.lru_cache(maxsize=32)
+def _text_label(text, font_size, bold=False):
+    """Rasterize a short glyph string once; the CoreLabel refills its texture after a GL reset"""
+    label = CoreLabel(text=text, font_size=font_size, bold=bold)
+    label.refresh()
+    return label
+
+def _text_image(text, font_size, bold=False, **kwargs):
+    """Image showing the cached rendering of static ``text`` (icons, header captions)
+    
+    The glyphs are rendered in white; pass ``color`` to tint them.
+    """
+    return Image(texture=_text_label(text, font_size, bold).texture, **kwargs)
+
+class ModernCard(RecycleDataViewBehavior, BoxLayout):
+    """Modern card with shadow and rounded corners
+    
+    Can serve as a RecycleView viewclass: instances are reused while
+    scrolling and each data dict is applied in refresh_view_attrs.
+    """
+    card_color = ColorProperty(CARD_COLOR)
+    index = None
+    
     def __init__(self, **kwargs):
+        # Styles go in as constructor defaults so each property is set once
+        kwargs.setdefault('padding', _DP[15])
+        kwargs.setdefault('spacing', _DP[10])
         super().__init__(**kwargs)
-        self.padding = dp(15)
-        self.spacing = dp(10)
-        
-        with self.canvas.before:
-            # Shadow
-            Color(*SHADOW_COLOR)
-            self.shadow = RoundedRectangle(
-                pos=(self.x + dp(2), self.y - dp(2)),
-                size=self.size,
-                radius=[dp(12)]
-            )
-            # Card background
-            Color(*CARD_COLOR)
-            self.rect = RoundedRectangle(
-                pos=self.pos,
-                size=self.size,
-                radius=[dp(12)]
-            )
-        
-        self.bind(pos=self.update_rect, size=self.update_rect)
     
-    def update_rect(self, *args):
-        self.rect.pos = self.pos
-        self.rect.size = self.size
-        self.shadow.pos = (self.x + dp(2), self.y - dp(2))
-        self.shadow.size = self.size
+    def refresh_view_attrs(self, rv, index, data):
+        # Remember which item this view currently shows
+        self.index = index
+        return super().refresh_view_attrs(rv, index, data)
 
 class ModernButton(Button):
     """Modern styled button with hover effect"""
+    button_color = ColorProperty(BUTTON_PRIMARY)
+    # Colour painted by the rounded background; follows button_color and is
+    # what the press/release animations drive
+    fill_color = ColorProperty(BUTTON_PRIMARY)
+    
+    # Subtle press animation, shared by every button
+    _press_anim = Animation(fill_color=BUTTON_HOVER, duration=0.1)
+    _release_anim = None
+    
     def __init__(self, **kwargs):
-        # Extract custom color if provided
-        self.button_color = kwargs.pop('button_color', BUTTON_PRIMARY)
-        
+        # The rounded rectangle from the KV rule is the only fill
+        kwargs.setdefault('background_color', (0, 0, 0, 0))
+        kwargs.setdefault('background_normal', '')
+        kwargs.setdefault('background_down', '')
+        kwargs.setdefault('color', (1, 1, 1, 1))
+        kwargs.setdefault('bold', True)
+        kwargs.setdefault('font_size', _SP[14])
         super().__init__(**kwargs)
-        self.background_color = self.button_color
-        self.background_normal = ''
-        self.color = (1, 1, 1, 1)
-        self.bold = True
-        self.font_size = sp(14)
-        
-        # Add rounded corners
-        with self.canvas.before:
-            Color(*self.button_color)
-            self.rect = RoundedRectangle(
-                pos=self.pos,
-                size=self.size,
-                radius=[dp(8)]
-            )
-        
-        self.bind(pos=self.update_rect, size=self.update_rect)
+        self._release_anim = Animation(fill_color=self.button_color, duration=0.1)
     
-    def update_rect(self, *args):
-        self.rect.pos = self.pos
-        self.rect.size = self.size
+    def on_button_color(self, instance, value):
+        self.fill_color = value
+        # Return to the current color, not the one the button was created with
+        if self._release_anim is not None:
+            self._release_anim.cancel(self)
+            self._release_anim = Animation(fill_color=value, duration=0.1)
     
     def on_press(self):
-        # Subtle press animation
-        anim = Animation(background_color=BUTTON_HOVER, duration=0.1)
-        anim.start(self)
+        self._release_anim.cancel(self)
+        self._press_anim.start(self)
     
     def on_release(self):
         # Return to original color
-        anim = Animation(background_color=self.button_color, duration=0.1)
-        anim.start(self)
+        self._press_anim.cancel(self)
+        self._release_anim.start(self)
 
 class ModernLabel(Label):
     """Modern styled label"""
-    def __init__(self, title=False, subtitle=False, **kwargs):
-        super().__init__(**kwargs)
-        
-        if title:
-            self.font_size = sp(24)
-            self.bold = True
-            self.color = TEXT_PRIMARY
-        elif subtitle:
-            self.font_size = sp(16)
-            self.bold = True
-            self.color = TEXT_SECONDARY
-        else:
-            self.font_size = sp(14)
-            self.color = TEXT_PRIMARY
+    # Styles are property defaults, so constructing a label sets nothing extra
+    font_size = NumericProperty(_SP[14])
+    color = ColorProperty(TEXT_PRIMARY)
+
+class ModernTitleLabel(ModernLabel):
+    """Large bold label for screen titles"""
+    font_size = NumericProperty(_SP[24])
+    bold = BooleanProperty(True)
+
+class ModernSubtitleLabel(ModernLabel):
+    """Bold secondary-colored label for section headings and status text"""
+    font_size = NumericProperty(_SP[16])
+    bold = BooleanProperty(True)
+    color = ColorProperty(TEXT_SECONDARY)
+
+# 1x2 texture holding the header colours; the GPU interpolates between them.
+# Created on first use because it needs a GL context.
+_header_gradient = None
+
+def _fill_header_gradient(texture):
+    # Bottom texel first: the lighter end colour sits under the darker start colour
+    data = bytes(int(round(c * 255)) for c in HEADER_GRADIENT_END + HEADER_GRADIENT_START)
+    texture.blit_buffer(data, colorfmt='rgba', bufferfmt='ubyte')
+
+def _get_header_gradient():
+    global _header_gradient
+    if _header_gradient is None:
+        _header_gradient = Texture.create(size=(1, 2), colorfmt='rgba')
+        # Sample between the two texel centres so the whole header is the blend
+        _header_gradient.uvpos = (0.5, 0.25)
+        _header_gradient.uvsize = (0, 0.5)
+        _fill_header_gradient(_header_gradient)
+        # Refill after the GL context is lost (e.g. app resumed on Android)
+        _header_gradient.add_reload_observer(_fill_header_gradient)
+    return _header_gradient
 
 class GradientHeader(BoxLayout):
     """Beautiful gradient header"""
+    gradient_texture = ObjectProperty(None, allownone=True)
+    
     def __init__(self, title_text="", **kwargs):
+        kwargs.setdefault('gradient_texture', _get_header_gradient())
+        kwargs.setdefault('size_hint_y', None)
+        kwargs.setdefault('height', _DP[100])
         super().__init__(**kwargs)
-        self.size_hint_y = None
-        self.height = dp(100)
-        
-        # Create gradient background
-        with self.canvas.before:
-            # Gradient effect (using two rectangles)
-            Color(*HEADER_GRADIENT_START)
-            self.rect1 = Rectangle(pos=self.pos, size=self.size)
-            Color(*HEADER_GRADIENT_END)
-            self.rect2 = Rectangle(
-                pos=self.pos,
-                size=(self.width, self.height / 2)
-            )
-        
-        self.bind(pos=self.update_rect, size=self.update_rect)
         
         # Content layout
-        content = BoxLayout(orientation='vertical', padding=dp(20), spacing=dp(5))
+        content = BoxLayout(orientation='vertical', padding=_DP[20], spacing=_DP[5])
+        
+        # The header text never changes, so it is drawn from cached textures
+        # instead of Labels that re-layout on every resize
         
         # Title
-        title = Label(
-            text=title_text,
-            font_size=sp(28),
+        title = _text_image(
+            title_text,
+            _SP[28],
             bold=True,
-            color=(1, 1, 1, 1),
             size_hint_y=None,
-            height=dp(40)
+            height=_DP[40]
         )
         content.add_widget(title)
         
         # Subtitle with developer info
-        subtitle = Label(
-            text=f'Programmed by {Config.DEVELOPER} © {Config.YEAR}',
-            font_size=sp(13),
+        subtitle = _text_image(
+            f'Programmed by {Config.DEVELOPER} © {Config.YEAR}',
+            _SP[13],
             color=(1, 1, 1, 0.8),
             size_hint_y=None,
-            height=dp(20)
+            height=_DP[20]
         )
         content.add_widget(subtitle)
         
         # Version
-        version = Label(
-            text=f'Version {Config.APP_VERSION}',
-            font_size=sp(11),
+        version = _text_image(
+            f'Version {Config.APP_VERSION}',
+            _SP[11],
             color=(1, 1, 1, 0.6),
             size_hint_y=None,
-            height=dp(15)
+            height=_DP[15]
         )
         content.add_widget(version)
         
         self.add_widget(content)
-    
-    def update_rect(self, *args):
-        self.rect1.pos = self.pos
-        self.rect1.size = self.size
-        self.rect2.pos = self.pos
-        self.rect2.size = (self.width, self.height / 2)
+
+# Button handlers bound with fbind and explicit arguments, so binding them
+# does not allocate a closure per widget
+def _fire_search(text_input, on_search, button):
+    on_search(text_input.text)
+
+def _close_dialog(dialog, callback, button):
+    if callback:
+        callback()
+    dialog.dismiss()
 
 class SearchBar(BoxLayout):
     """Modern search bar with icon"""
+    card_color = ColorProperty(CARD_COLOR)
+    
     def __init__(self, on_search=None, on_clear=None, **kwargs):
+        kwargs.setdefault('orientation', 'horizontal')
+        kwargs.setdefault('size_hint_y', None)
+        kwargs.setdefault('height', _DP[50])
+        kwargs.setdefault('spacing', _DP[10])
         super().__init__(**kwargs)
-        self.orientation = 'horizontal'
-        self.size_hint_y = None
-        self.height = dp(50)
-        self.spacing = dp(10)
-        
-        # Add card background
-        with self.canvas.before:
-            Color(*CARD_COLOR)
-            self.rect = RoundedRectangle(
-                pos=self.pos,
-                size=self.size,
-                radius=[dp(10)]
-            )
-        self.bind(pos=self.update_rect, size=self.update_rect)
         
         # Search icon
-        self.add_widget(Label(
-            text='🔍',
+        self.add_widget(_text_image(
+            '🔍',
+            _SP[20],
             size_hint_x=None,
-            width=dp(40),
-            font_size=sp(20)
+            width=_DP[40]
         ))
         
         # Search input
@@ -756,8 +1263,8 @@ class SearchBar(BoxLayout):
             background_color=(0, 0, 0, 0),
             foreground_color=TEXT_PRIMARY,
             cursor_color=PRIMARY_COLOR,
-            font_size=sp(14),
-            padding=[dp(10), dp(12)]
+            font_size=_SP[14],
+            padding=[_DP[10], _DP[12]]
         )
         self.add_widget(self.search_input)
         
@@ -768,7 +1275,7 @@ class SearchBar(BoxLayout):
             button_color=PRIMARY_COLOR
         )
         if on_search:
-            self.search_btn.bind(on_press=lambda x: on_search(self.search_input.text))
+            self.search_btn.fbind('on_press', _fire_search, self.search_input, on_search)
         self.add_widget(self.search_btn)
         
         # Clear button
@@ -778,17 +1285,13 @@ class SearchBar(BoxLayout):
             button_color=TEXT_SECONDARY
         )
         if on_clear:
-            self.clear_btn.bind(on_press=lambda x: self._clear())
+            self.clear_btn.fbind('on_press', self._clear)
         self.add_widget(self.clear_btn)
         
         self.on_search_callback = on_search
         self.on_clear_callback = on_clear
     
-    def update_rect(self, *args):
-        self.rect.pos = self.pos
-        self.rect.size = self.size
-    
-    def _clear(self):
+    def _clear(self, *args):
         self.search_input.text = ''
         if self.on_clear_callback:
             self.on_clear_callback()
@@ -796,7 +1299,7 @@ class SearchBar(BoxLayout):
 class LoadingPopup(Popup):
     """Modern loading indicator"""
     def __init__(self, title='Loading...', **kwargs):
-        content = BoxLayout(orientation='vertical', padding=dp(30), spacing=dp(20))
+        content = BoxLayout(orientation='vertical', padding=_DP[30], spacing=_DP[20])
         
         # Progress bar with modern styling
         self.progress = ProgressBar(max=100)
@@ -807,10 +1310,15 @@ class LoadingPopup(Popup):
             self.progress_bg = RoundedRectangle(
                 pos=self.progress.pos,
                 size=self.progress.size,
-                radius=[dp(8)]
+                radius=_R8
             )
+        # pos and size change together during layout; redraw once per frame
+        update_bg = Clock.create_trigger(self._update_progress_bg, -1)
+        self.progress.bind(pos=update_bg, size=update_bg)
         
-        self.label = ModernLabel(text='Please wait...', subtitle=True)
+        self.label = ModernSubtitleLabel(text='Please wait...')
+        self._last_percent = 0
+        self._last_message = None
         
         content.add_widget(self.progress)
         content.add_widget(self.label)
@@ -824,37 +1332,44 @@ class LoadingPopup(Popup):
             **kwargs
         )
     
+    def _update_progress_bg(self, *args):
+        self.progress_bg.pos = self.progress.pos
+        self.progress_bg.size = self.progress.size
+    
     def update_progress(self, value, message=''):
-        self.progress.value = value * 100
-        if message:
+        # Whole percents only; repeated values and messages are not re-dispatched
+        percent = round(value * 100)
+        if percent != self._last_percent:
+            self._last_percent = percent
+            self.progress.value = percent
+        if message and message != self._last_message:
+            self._last_message = message
             self.label.text = message
 
 class ConfirmationDialog(Popup):
     """Modern confirmation dialog"""
     def __init__(self, message, on_yes=None, on_no=None, **kwargs):
-        content = BoxLayout(orientation='vertical', padding=dp(20), spacing=dp(20))
+        content = BoxLayout(orientation='vertical', padding=_DP[20], spacing=_DP[20])
         
         # Icon
-        icon_box = BoxLayout(size_hint_y=None, height=dp(60))
-        icon = Label(
-            text='⚠️',
-            font_size=sp(40),
+        icon = _text_image(
+            '⚠️',
+            _SP[40],
             size_hint_y=None,
-            height=dp(60)
+            height=_DP[60]
         )
-        icon_box.add_widget(icon)
-        content.add_widget(icon_box)
+        content.add_widget(icon)
         
         # Message
         msg_label = ModernLabel(
             text=message,
             size_hint_y=None,
-            height=dp(80)
+            height=_DP[80]
         )
         content.add_widget(msg_label)
         
         # Buttons
-        btn_layout = BoxLayout(spacing=dp(15), size_hint_y=None, height=dp(50))
+        btn_layout = BoxLayout(spacing=_DP[15], size_hint_y=None, height=_DP[50])
         
         no_btn = ModernButton(
             text='Cancel',
@@ -865,15 +1380,8 @@ class ConfirmationDialog(Popup):
             button_color=ERROR_COLOR
         )
         
-        if on_yes:
-            yes_btn.bind(on_press=lambda x: (on_yes(), self.dismiss()))
-        else:
-            yes_btn.bind(on_press=lambda x: self.dismiss())
-        
-        if on_no:
-            no_btn.bind(on_press=lambda x: (on_no(), self.dismiss()))
-        else:
-            no_btn.bind(on_press=lambda x: self.dismiss())
+        yes_btn.fbind('on_press', _close_dialog, self, on_yes)
+        no_btn.fbind('on_press', _close_dialog, self, on_no)
         
         btn_layout.add_widget(no_btn)
         btn_layout.add_widget(yes_btn)
@@ -887,73 +1395,178 @@ class ConfirmationDialog(Popup):
             **kwargs
         )
 
-def show_error(message, title='Error'):
-    """Show modern error popup"""
-    content = BoxLayout(orientation='vertical', padding=dp(20), spacing=dp(15))
+def _make_icon_popup(icon, color):
+    """Build a message popup with an icon and an OK button"""
+    content = BoxLayout(orientation='vertical', padding=_DP[20], spacing=_DP[15])
     
-    # Error icon
-    icon = Label(text='❌', font_size=sp(50), size_hint_y=None, height=dp(70))
-    content.add_widget(icon)
+    # Icon
+    icon_label = _text_image(icon, _SP[50], size_hint_y=None, height=_DP[70])
+    content.add_widget(icon_label)
     
     # Message
-    msg = ModernLabel(text=message, size_hint_y=None, height=dp(100))
+    msg = ModernLabel(size_hint_y=None, height=_DP[100])
     content.add_widget(msg)
     
     # OK button
     ok_btn = ModernButton(
         text='OK',
         size_hint=(None, None),
-        size=(dp(120), dp(45)),
+        size=(_DP[120], _DP[45]),
         pos_hint={'center_x': 0.5},
-        button_color=ERROR_COLOR
+        button_color=color
     )
     
     popup = Popup(
-        title=title,
         content=content,
         size_hint=(0.7, 0.5),
         auto_dismiss=False
     )
     
-    ok_btn.bind(on_press=popup.dismiss)
+    # Dismiss without the fade-out: the popup is reused, and reopening it
+    # while the animation is still running would be silently ignored
+    ok_btn.bind(on_press=functools.partial(popup.dismiss, animation=False))
     content.add_widget(ok_btn)
     
+    popup.msg_label = msg
+    return popup
+
+# Error and success popups are built on first use and then reused
+_icon_popups = {}
+
+def _show_icon_popup(kind, icon, color, message, title):
+    popup = _icon_popups.get(kind)
+    if popup is None:
+        popup = _icon_popups[kind] = _make_icon_popup(icon, color)
+    popup.title = title
+    popup.msg_label.text = message
     popup.open()
-    logger.error(f"{title}: {message}")
+
+def show_error(message, title='Error'):
+    """Show modern error popup"""
+    _show_icon_popup('error', '❌', ERROR_COLOR, message, title)
+    logger.error("%s: %s", title, message)
 
 def show_success(message, title='Success'):
     """Show modern success popup"""
-    content = BoxLayout(orientation='vertical', padding=dp(20), spacing=dp(15))
-    
-    # Success icon
-    icon = Label(text='✅', font_size=sp(50), size_hint_y=None, height=dp(70))
-    content.add_widget(icon)
+    _show_icon_popup('success', '✅', SUCCESS_COLOR, message, title)
+    logger.info("%s: %s", title, message)
+
+# ============================================
+# STUDENT LIST ROWS
+# ============================================
+
+# Row templates for the student RecycleView; only the visible rows exist and
+# they are refilled from the list data while scrolling. Metrics are #:set
+# once here instead of calling dp() each time a row view is built
+Builder.load_string('''
+#:set R6 [dp(6)]
+#:set ROW_SPACING dp(5)
+#:set ROW_PAD [dp(5), dp(3)]
+#:set HEADER_PAD [dp(5), 0]
+
+<StudentHeaderRow@BoxLayout>:
+    spacing: ROW_SPACING
+    padding: HEADER_PAD
+    ModernLabel:
+        text: '#'
+        size_hint_x: 0.08
+        bold: True
+    ModernLabel:
+        text: 'Matricule'
+        size_hint_x: 0.22
+        bold: True
+    ModernLabel:
+        text: 'Full Name'
+        size_hint_x: 0.35
+        bold: True
+    ModernLabel:
+        text: 'Section'
+        size_hint_x: 0.15
+        bold: True
+    ModernLabel:
+        text: 'Actions'
+        size_hint_x: 0.2
+        bold: True
+
+<StudentRow>:
+    spacing: ROW_SPACING
+    padding: ROW_PAD
+    canvas.before:
+        Color:
+            rgba: root.even_color if root.index % 2 == 0 else root.odd_color
+        RoundedRectangle:
+            pos: self.pos
+            size: self.size
+            radius: R6
+    ModernLabel:
+        text: root.num
+        size_hint_x: 0.08
+    ModernLabel:
+        text: root.matricule
+        size_hint_x: 0.22
+    ModernLabel:
+        text: root.full_name
+        size_hint_x: 0.35
+    ModernLabel:
+        text: root.section
+        size_hint_x: 0.15
+    BoxLayout:
+        size_hint_x: 0.2
+        spacing: ROW_SPACING
+        ModernButton:
+            text: '👁'
+            size_hint_x: 0.5
+            button_color: root.view_color
+            on_press: root.view_details()
+        ModernButton:
+            text: '🗑'
+            size_hint_x: 0.5
+            button_color: root.delete_color
+            on_press: root.confirm_delete()
+''')
+
+# Body of the student details popup, filled from get_student_with_stats()
+_DETAILS_TEMPLATE = """[b]{prenom} {nom}[/b]
+
+📋 Matricule: {matricule}
+📚 Section: {section}
+👥 Group: {groupe}
+
+📊 Academic Performance:
+   • Average Score: {avg_score}/20
+   • Best Score: {max_score}/20
+   • Worst Score: {min_score}/20
+   • Total Exams: {total_marks}
+
+📅 Attendance:
+   • Total Classes: {total_classes}
+   • Present: {present_count}
+   • Attendance Rate: {attendance_rate}%
+"""
+
+class StudentRow(RecycleDataViewBehavior, BoxLayout):
+    """One student in the list; a recycled view filled from a data dict"""
+    student_id = NumericProperty(0)
+    num = StringProperty('')
+    matricule = StringProperty('')
+    full_name = StringProperty('')
+    section = StringProperty('')
+    # Position in the list; the KV rule alternates the background on it
+    index = NumericProperty(0)
+    even_color = ColorProperty(BACKGROUND_DARK)
+    odd_color = ColorProperty(CARD_COLOR)
+    view_color = ColorProperty(INFO_COLOR)
+    delete_color = ColorProperty(ERROR_COLOR)
     
-    # Message
-    msg = ModernLabel(text=message, size_hint_y=None, height=dp(100))
-    content.add_widget(msg)
+    def refresh_view_attrs(self, rv, index, data):
+        self.index = index
+        return super().refresh_view_attrs(rv, index, data)
     
-    # OK button
-    ok_btn = ModernButton(
-        text='OK',
-        size_hint=(None, None),
-        size=(dp(120), dp(45)),
-        pos_hint={'center_x': 0.5},
-        button_color=SUCCESS_COLOR
-    )
+    def view_details(self):
+        App.get_running_app().main_screen._on_view(self)
     
-    popup = Popup(
-        title=title,
-        content=content,
-        size_hint=(0.7, 0.5),
-        auto_dismiss=False
-    )
-    
-    ok_btn.bind(on_press=popup.dismiss)
-    content.add_widget(ok_btn)
-    
-    popup.open()
-    logger.info(f"{title}: {message}")
+    def confirm_delete(self):
+        App.get_running_app().main_screen._on_delete(self)
 
 # ============================================
 # MAIN SCREEN WITH MODERN GUI
@@ -967,8 +1580,25 @@ class MainScreen(Screen):
         self.selected_groupe = None
         self.current_page = 1
         self.total_pages = 1
+        # Keyset cursor of every page up to the current one (None = first page)
+        # and the cursor of the page after it, once known
+        self._page_cursors = [None]
+        self._next_cursor = None
         self.search_mode = False
         self.search_results = []
+        # Last applied pagination button state (None until first update)
+        self._prev_disabled = None
+        self._next_disabled = None
+        # Database calls run here, one at a time and in submission order,
+        # so SQLite work never blocks the UI thread
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        # id -> student tuple for the rows on screen; row data carries only the id
+        self._student_by_id = {}
+        # (groupe, cursor) -> _fetch_page result, least recent first
+        self._page_cache = OrderedDict()
+        # Student details popup, built on first use (see _ensure_details_popup)
+        self._details_popup = None
+        self._details_label = None
         
         self.build_ui()
     
@@ -988,9 +1618,7 @@ class MainScreen(Screen):
         )
         
         # Top controls card
-        controls_card = ModernCard(size_hint_y=None, height=dp(70))
-        controls_card.orientation = 'horizontal'
-        controls_card.spacing = dp(10)
+        controls_card = ModernCard(size_hint_y=None, height=dp(70), orientation='horizontal', spacing=dp(10))
         
         # Group selector
         self.group_spinner = Spinner(
@@ -1050,30 +1678,41 @@ class MainScreen(Screen):
         content_area.add_widget(self.search_bar)
         
         # Student count label
-        self.count_label = ModernLabel(
+        self.count_label = ModernSubtitleLabel(
             text='Select a group to view students',
-            subtitle=True,
             size_hint_y=None,
             height=dp(30)
         )
         content_area.add_widget(self.count_label)
         
         # Student list in a card
-        list_card = ModernCard()
-        list_card.orientation = 'vertical'
-        list_card.spacing = 0
-        list_card.padding = 0
-        
-        scroll = ScrollView()
-        self.student_grid = GridLayout(
-            cols=1,
-            spacing=dp(2),
+        list_card = ModernCard(orientation='vertical', spacing=0, padding=0)
+        
+        # Column header, built once and kept above the scrolling rows
+        # (side padding matches the rows inside the list layout)
+        self.header_row = Factory.StudentHeaderRow(
             size_hint_y=None,
+            height=dp(55),
+            padding=[dp(15), dp(10), dp(15), 0]
+        )
+        list_card.add_widget(self.header_row)
+        
+        self.student_list = RecycleView()
+        # Every item is one fixed-height row (the empty-state item only names
+        # its own viewclass), so no per-item size is looked up
+        student_layout = RecycleBoxLayout(
+            viewclass='StudentRow',
+            key_viewclass='viewclass',
+            orientation='vertical',
+            default_size=(None, dp(55)),
+            default_size_hint=(1, None),
+            size_hint_y=None,
+            spacing=dp(2),
             padding=dp(10)
         )
-        self.student_grid.bind(minimum_height=self.student_grid.setter('height'))
-        scroll.add_widget(self.student_grid)
-        list_card.add_widget(scroll)
+        student_layout.bind(minimum_height=student_layout.setter('height'))
+        self.student_list.add_widget(student_layout)
+        list_card.add_widget(self.student_list)
         
         content_area.add_widget(list_card)
         
@@ -1089,9 +1728,8 @@ class MainScreen(Screen):
         self.prev_btn.bind(on_press=lambda x: self.change_page(-1))
         pagination.add_widget(self.prev_btn)
         
-        self.page_label = ModernLabel(
+        self.page_label = ModernSubtitleLabel(
             text='Page 1 of 1',
-            subtitle=True,
             size_hint_x=0.5
         )
         pagination.add_widget(self.page_label)
@@ -1125,12 +1763,32 @@ class MainScreen(Screen):
         
         self.add_widget(main_layout)
         
-        # Load groups on init
-        Clock.schedule_once(lambda dt: self.refresh_groups(), 0.5)
+        # Load groups on init; the query runs on the worker, so the first
+        # frame draws while it is in flight
+        self.refresh_groups()
+    
+    def _run_db(self, fn, on_done, *args):
+        """Run ``fn(*args)`` on the database worker and pass the result to
+        ``on_done`` on the main thread"""
+        def task():
+            try:
+                result = fn(*args)
+            except Exception as e:
+                logger.error(f"Database task {fn.__name__} failed: {e}")
+                return
+            Clock.schedule_once(lambda dt: on_done(result), 0)
+        
+        self._executor.submit(task)
+    
+    def shutdown(self):
+        """Wait for queued database work to finish"""
+        self._executor.shutdown(wait=True)
     
     def refresh_groups(self):
         """Refresh the list of available groups"""
-        groups = self.db.get_all_groups()
+        self._run_db(self.db.get_all_groups, self._show_groups)
+    
+    def _show_groups(self, groups):
         if groups:
             self.group_spinner.values = groups
             logger.info(f"Loaded {len(groups)} groups")
@@ -1142,7 +1800,7 @@ class MainScreen(Screen):
         """Handle group selection"""
         if text and text != 'Select Group' and text != 'No groups available':
             self.selected_groupe = text
-            self.current_page = 1
+            self._reset_pages()
             self.search_mode = False
             self.search_bar.search_input.text = ''
             self.load_students()
@@ -1152,27 +1810,62 @@ class MainScreen(Screen):
         if not self.selected_groupe:
             return
         
-        students, page, total_pages, total_count = self.db.get_students_paginated(
+        page_cursor = self._page_cursors[-1]
+        key = (self.selected_groupe, page_cursor)
+        cached = self._page_cache.get(key)
+        if cached is not None:
+            self._page_cache.move_to_end(key)
+            self._show_page(cached)
+            return
+        
+        self._run_db(
+            self._fetch_page,
+            functools.partial(self._cache_page, key),
             self.selected_groupe,
-            self.current_page
+            page_cursor
         )
+    
+    def _fetch_page(self, groupe, page_cursor):
+        """Worker side of load_students: one keyset page plus the group total"""
+        students, next_cursor = self.db.get_students_after(groupe, *(page_cursor or ()))
+        return students, next_cursor, self.db.count_students(groupe)
+    
+    def _reset_pages(self):
+        self._page_cursors = [None]
+        self._next_cursor = None
+        self.current_page = 1
+    
+    def _cache_page(self, key, result):
+        # Empty results (including query errors) are not worth keeping
+        if result[0]:
+            self._page_cache[key] = result
+            if len(self._page_cache) > Config.PAGE_CACHE_SIZE:
+                self._page_cache.popitem(last=False)
+        # The group or page may have changed while this fetch was running
+        if key == (self.selected_groupe, self._page_cursors[-1]):
+            self._show_page(result)
+    
+    def _show_page(self, result):
+        # A search started while the page was loading takes over the list
+        if self.search_mode:
+            return
+        
+        students, next_cursor, total_count = result
         
-        self.total_pages = total_pages
+        self._next_cursor = next_cursor
+        self.total_pages = max(1, -(-total_count // Config.STUDENTS_PER_PAGE))
         self.display_students(students, total_count)
         self.update_pagination_controls()
     
     def display_students(self, students, total_count=None):
         """Display student list with modern design"""
-        self.student_grid.clear_widgets()
+        self._student_by_id = {s[0]: s for s in students}
         
         if not students:
-            empty_label = ModernLabel(
-                text='No students found',
-                subtitle=True,
-                size_hint_y=None,
-                height=dp(80)
-            )
-            self.student_grid.add_widget(empty_label)
+            self.student_list.data = [{
+                'viewclass': 'ModernSubtitleLabel',
+                'text': 'No students found'
+            }]
             self.count_label.text = 'No students'
             return
         
@@ -1183,94 +1876,61 @@ class MainScreen(Screen):
             else:
                 self.count_label.text = f'📊 Total: {total_count} students (Page {self.current_page}/{self.total_pages})'
         
-        # Header
-        header = BoxLayout(size_hint_y=None, height=dp(45), spacing=dp(5), padding=[dp(5), 0])
-        header.add_widget(ModernLabel(text='#', size_hint_x=0.08, bold=True))
-        header.add_widget(ModernLabel(text='Matricule', size_hint_x=0.22, bold=True))
-        header.add_widget(ModernLabel(text='Full Name', size_hint_x=0.35, bold=True))
-        header.add_widget(ModernLabel(text='Section', size_hint_x=0.15, bold=True))
-        header.add_widget(ModernLabel(text='Actions', size_hint_x=0.2, bold=True))
-        self.student_grid.add_widget(header)
-        
-        # Student rows with alternating colors
+        # Student rows (StudentRow alternates their colors)
+        data = []
         start_num = (self.current_page - 1) * Config.STUDENTS_PER_PAGE + 1
         for idx, student in enumerate(students):
-            row = BoxLayout(size_hint_y=None, height=dp(55), spacing=dp(5), padding=[dp(5), dp(3)])
-            
-            # Alternating row colors
-            bg_color = BACKGROUND_DARK if idx % 2 == 0 else CARD_COLOR
-            with row.canvas.before:
-                Color(*bg_color)
-                row.rect = RoundedRectangle(
-                    pos=row.pos,
-                    size=row.size,
-                    radius=[dp(6)]
-                )
-            row.bind(size=lambda obj, val: setattr(obj.rect, 'size', val))
-            row.bind(pos=lambda obj, val: setattr(obj.rect, 'pos', val))
-            
-            # Row number
-            row.add_widget(ModernLabel(text=str(start_num + idx), size_hint_x=0.08))
-            
-            # Matricule
-            row.add_widget(ModernLabel(text=student[1], size_hint_x=0.22))
-            
-            # Full name
-            full_name = f"{student[3]} {student[2]}"
-            row.add_widget(ModernLabel(text=full_name, size_hint_x=0.35))
-            
-            # Section
-            section = student[4] if student[4] else 'N/A'
-            row.add_widget(ModernLabel(text=section, size_hint_x=0.15))
-            
-            # Actions
-            actions = BoxLayout(size_hint_x=0.2, spacing=dp(5))
-            
-            view_btn = ModernButton(
-                text='👁',
-                size_hint_x=0.5,
-                button_color=INFO_COLOR
-            )
-            view_btn.bind(on_press=lambda x, s=student: self.view_student_details(s))
-            actions.add_widget(view_btn)
-            
-            delete_btn = ModernButton(
-                text='🗑',
-                size_hint_x=0.5,
-                button_color=ERROR_COLOR
-            )
-            delete_btn.bind(on_press=lambda x, s=student: self.confirm_delete_student(s))
-            actions.add_widget(delete_btn)
-            
-            row.add_widget(actions)
-            
-            self.student_grid.add_widget(row)
+            data.append({
+                'student_id': student[0],
+                'num': str(start_num + idx),
+                'matricule': student[1],
+                'full_name': f"{student[3]} {student[2]}",
+                'section': student[4] if student[4] else 'N/A'
+            })
+        
+        self.student_list.data = data
+    
+    def _on_view(self, row):
+        self.view_student_details(self._student_by_id[row.student_id])
+    
+    def _on_delete(self, row):
+        self.confirm_delete_student(self._student_by_id[row.student_id])
     
     def update_pagination_controls(self):
         """Update pagination button states"""
         self.page_label.text = f'Page {self.current_page} of {self.total_pages}'
         
-        self.prev_btn.disabled = (self.current_page <= 1)
-        self.next_btn.disabled = (self.current_page >= self.total_pages)
-        
-        # Update button colors based on state
-        if self.prev_btn.disabled:
-            self.prev_btn.button_color = DISABLED_COLOR
-        else:
-            self.prev_btn.button_color = PRIMARY_COLOR
-        
-        if self.next_btn.disabled:
-            self.next_btn.button_color = DISABLED_COLOR
-        else:
-            self.next_btn.button_color = PRIMARY_COLOR
+        self._set_page_buttons(
+            prev_disabled=(self.current_page <= 1),
+            next_disabled=(self._next_cursor is None)
+        )
+    
+    def _set_page_buttons(self, prev_disabled, next_disabled):
+        """Apply pagination button states, touching only buttons whose state flipped"""
+        if prev_disabled != self._prev_disabled:
+            self._prev_disabled = prev_disabled
+            self.prev_btn.disabled = prev_disabled
+            self.prev_btn.button_color = DISABLED_COLOR if prev_disabled else PRIMARY_COLOR
+        
+        if next_disabled != self._next_disabled:
+            self._next_disabled = next_disabled
+            self.next_btn.disabled = next_disabled
+            self.next_btn.button_color = DISABLED_COLOR if next_disabled else PRIMARY_COLOR
     
     def change_page(self, direction):
         """Change current page"""
-        new_page = self.current_page + direction
+        if direction > 0 and self._next_cursor is not None:
+            self._page_cursors.append(self._next_cursor)
+        elif direction < 0 and len(self._page_cursors) > 1:
+            self._page_cursors.pop()
+        else:
+            return
         
-        if 1 <= new_page <= self.total_pages:
-            self.current_page = new_page
-            self.load_students()
+        # Known again once the new page arrives; until then Next has nothing to follow
+        self._next_cursor = None
+        self.current_page = len(self._page_cursors)
+        self.update_pagination_controls()
+        self.load_students()
     
     def perform_search(self, query):
         """Perform student search"""
@@ -1279,70 +1939,71 @@ class MainScreen(Screen):
             return
         
         self.search_mode = True
-        self.search_results = self.db.search_students(query, self.selected_groupe)
+        self._run_db(self.db.search_students, self._show_search_results, query, self.selected_groupe)
+    
+    def _show_search_results(self, results):
+        # A search cleared while the query was running no longer applies
+        if not self.search_mode:
+            return
         
+        self.search_results = results
         self.display_students(self.search_results)
         
         # Disable pagination in search mode
-        self.prev_btn.disabled = True
-        self.next_btn.disabled = True
+        self._set_page_buttons(prev_disabled=True, next_disabled=True)
         self.page_label.text = 'Search Results'
     
     def clear_search(self):
         """Clear search and return to normal view"""
         self.search_mode = False
         self.search_results = []
-        self.current_page = 1
+        self._reset_pages()
         
         if self.selected_groupe:
             self.load_students()
         else:
-            self.student_grid.clear_widgets()
+            self.student_list.data = []
             self.count_label.text = 'Select a group'
     
     def view_student_details(self, student):
         """Show detailed student information in modern popup"""
-        stats = self.db.get_student_stats(student[0])
-        
+        self._run_db(self.db.get_student_with_stats, self._show_student_details, student[0])
+    
+    def _show_student_details(self, stats):
         if not stats:
             show_error("Could not load student details")
             return
         
-        content = BoxLayout(orientation='vertical', padding=dp(20), spacing=dp(15))
+        student = stats['student']
+        popup = self._ensure_details_popup()
+        self._details_label.text = _DETAILS_TEMPLATE.format(
+            nom=student[2], prenom=student[3], matricule=student[1],
+            section=student[4] or 'N/A', groupe=student[5], **stats
+        )
+        # Stop and finish a fade-out still running from a tap outside; otherwise
+        # open() is ignored, or the old animation removes the popup when it ends
+        Animation.cancel_all(popup, '_anim_alpha')
+        popup.dismiss(animation=False)
+        popup.open()
+    
+    def _ensure_details_popup(self):
+        """Build the student details popup on first use; later opens only refill its text"""
+        if self._details_popup is not None:
+            return self._details_popup
+        
+        content = BoxLayout(orientation='vertical', padding=_DP[20], spacing=_DP[15])
         
         # Student icon
-        icon = Label(text='👨‍🎓', font_size=sp(60), size_hint_y=None, height=dp(80))
+        icon = _text_image('👨‍🎓', _SP[60], size_hint_y=None, height=_DP[80])
         content.add_widget(icon)
         
         # Info card
-        info_card = ModernCard()
-        info_card.orientation = 'vertical'
-        info_card.size_hint_y = None
-        info_card.height = dp(280)
-        
-        details_text = f"""[b]{student[3]} {student[2]}[/b]
-
-📋 Matricule: {student[1]}
-📚 Section: {student[4] or 'N/A'}
-👥 Group: {student[5]}
-
-📊 Academic Performance:
-   • Average Score: {stats['avg_score']}/20
-   • Best Score: {stats['max_score']}/20
-   • Worst Score: {stats['min_score']}/20
-   • Total Exams: {stats['total_marks']}
-
-📅 Attendance:
-   • Total Classes: {stats['total_classes']}
-   • Present: {stats['present_count']}
-   • Attendance Rate: {stats['attendance_rate']}%
-"""
+        info_card = ModernCard(orientation='vertical', size_hint_y=None, height=_DP[280])
         
         details_label = Label(
-            text=details_text,
             markup=True,
             color=TEXT_PRIMARY,
-            font_size=sp(13),
+            font_size=_SP[13],
             halign='left',
             valign='top'
         )
@@ -1355,7 +2016,7 @@ class MainScreen(Screen):
         close_btn = ModernButton(
             text='Close',
             size_hint=(None, None),
-            size=(dp(150), dp(45)),
+            size=(_DP[150], _DP[45]),
             pos_hint={'center_x': 0.5},
             button_color=PRIMARY_COLOR
         )
@@ -1366,10 +2027,12 @@ class MainScreen(Screen):
             size_hint=(0.8, 0.8)
         )
         
-        close_btn.bind(on_press=popup.dismiss)
+        close_btn.bind(on_press=functools.partial(popup.dismiss, animation=False))
         content.add_widget(close_btn)
         
-        popup.open()
+        self._details_label = details_label
+        self._details_popup = popup
+        return popup
     
     def confirm_delete_student(self, student):
         """Show confirmation before deleting student"""
@@ -1382,7 +2045,10 @@ class MainScreen(Screen):
     
     def delete_student(self, student_id):
         """Delete a student"""
-        success, message = self.db.delete_student(student_id)
+        self._run_db(self.db.delete_student, self._student_deleted, student_id)
+    
+    def _student_deleted(self, result):
+        success, message = result
         
         if success:
             show_success(message)
@@ -1392,6 +2058,8 @@ class MainScreen(Screen):
     
     def open_file_chooser(self, instance):
         """Open file chooser for Excel import"""
+        from kivy.uix.filechooser import FileChooserListView
+        
         content = BoxLayout(orientation='vertical', spacing=dp(10), padding=dp(10))
         
         # Group name input card
@@ -1463,17 +2131,12 @@ class MainScreen(Screen):
         def update_progress(value):
             loading.update_progress(value, f'Importing... {int(value * 100)}%')
         
-        def do_import():
-            success, message, count = self.db.import_from_excel(
-                file_path,
-                groupe_name,
-                progress_callback=update_progress
-            )
-            
-            Clock.schedule_once(lambda dt: self._import_complete(loading, success, message), 0)
-        
-        thread = threading.Thread(target=do_import)
-        thread.start()
+        self.db.import_from_excel_async(
+            file_path,
+            groupe_name,
+            progress_callback=update_progress,
+            on_done=lambda success, message, count: self._import_complete(loading, success, message)
+        )
     
     def _import_complete(self, loading_popup, success, message):
         """Handle import completion"""
@@ -1498,7 +2161,10 @@ class MainScreen(Screen):
         
         os.makedirs('exports', exist_ok=True)
         
-        success, message = self.db.export_to_excel(output_path, self.selected_groupe)
+        self._run_db(self.db.export_to_excel, self._export_complete, output_path, self.selected_groupe)
+    
+    def _export_complete(self, result):
+        success, message = result
         
         if success:
             show_success(message, 'Export Successful')
@@ -1507,7 +2173,10 @@ class MainScreen(Screen):
     
     def backup_database(self, instance):
         """Create database backup"""
-        success, result = self.db.backup_database()
+        self._run_db(self.db.backup_database, self._backup_complete)
+    
+    def _backup_complete(self, outcome):
+        success, result = outcome
         
         if success:
             show_success(f"Database backed up successfully!\n\n{result}", 'Backup Complete')
@@ -1516,6 +2185,9 @@ class MainScreen(Screen):
     
     def refresh_data(self):
         """Refresh current view"""
+        # Called after imports and deletes as well as from the Refresh button
+        self._page_cache.clear()
+        
         if self.search_mode:
             self.clear_search()
         elif self.selected_groupe:
@@ -1539,9 +2211,12 @@ class StudentTrackerApp(App):
         
         # Create screen manager
         sm = ScreenManager()
-        sm.add_widget(MainScreen(name='main', db=self.db))
+        self.main_screen = MainScreen(name='main', db=self.db)
+        sm.add_widget(self.main_screen)
         
-        # Schedule auto-backup
+        # Schedule auto-backup on its own worker, so a long copy never queues
+        # behind (or holds up) the screen's interactive queries
+        self._backup_executor = ThreadPoolExecutor(max_workers=1)
         Clock.schedule_interval(
             lambda dt: self.auto_backup(),
             Config.AUTO_BACKUP_INTERVAL
@@ -1551,8 +2226,15 @@ class StudentTrackerApp(App):
         return sm
     
     def auto_backup(self):
-        """Perform automatic database backup"""
-        success, result = self.db.backup_database()
+        """Perform automatic database backup on the backup worker"""
+        self._backup_executor.submit(self._do_auto_backup)
+    
+    def _do_auto_backup(self):
+        outcome = self.db.backup_database()
+        Clock.schedule_once(lambda dt: self._auto_backup_done(outcome), 0)
+    
+    def _auto_backup_done(self, outcome):
+        success, result = outcome
         if success:
             logger.info(f"Auto-backup completed: {result}")
         else:
@@ -1561,7 +2243,12 @@ class StudentTrackerApp(App):
     def on_stop(self):
         """Cleanup when app closes"""
         logger.info("Application closing")
+        # Let queued work and a running auto-backup finish, then take the
+        # final backup synchronously so it completes before we exit
+        self.main_screen.shutdown()
+        self._backup_executor.shutdown(wait=True)
         self.db.backup_database()
+        self.db.close_all()
 
 if __name__ == '__main__':
     StudentTrackerApp().run()